@@ -1,10 +1,12 @@
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from pathlib import Path
 import os
 
 from pydantic import BaseModel, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+_PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
 
 class TeamConfig(BaseModel):
     name: str
@@ -18,6 +20,10 @@ class ProjectConfig(BaseModel):
     github_project_id: str | None = None
 
     def resolved_teams(self) -> dict[str, TeamConfig]:
+        return self._resolved_teams
+
+    @cached_property
+    def _resolved_teams(self) -> dict[str, TeamConfig]:
         if self.teams:
             return self.teams
         if self.members is not None:
@@ -46,13 +52,13 @@ class Settings(BaseSettings):
     @field_validator("project_milestone_urls", mode="before")
     @classmethod
     def _normalize_project_milestone_urls(cls, value):
-        if value is None or value == "":
-            return None
-        if isinstance(value, dict):
-            return value
-        return value
+        return None if value == "" else value
 
     def list_projects(self) -> dict[str, ProjectConfig]:
+        return self._resolved_projects
+
+    @cached_property
+    def _resolved_projects(self) -> dict[str, ProjectConfig]:
         if self.projects:
             return self.projects
         if self.project_name:
@@ -95,11 +101,11 @@ def _balance_brackets(text: str) -> int:
     return text.count("{") + text.count("[") - text.count("}") - text.count("]")
 
 
-def _load_env_multiline_json(path: Path) -> None:
-    if not path.exists():
-        return
+_ENV_CACHE: tuple[Path, int, dict[str, str]] | None = None
+
 
-    lines = path.read_text(encoding="utf-8").splitlines()
+def _parse_env_lines(lines: list[str]) -> dict[str, str]:
+    pairs: dict[str, str] = {}
     i = 0
     while i < len(lines):
         raw = lines[i]
@@ -115,23 +121,41 @@ def _load_env_multiline_json(path: Path) -> None:
         if not key:
             continue
 
-        if key in os.environ:
-            continue
-
         if _is_json_multiline_start(value):
-            buffer = value
-            balance = _balance_brackets(buffer)
+            buffer_parts = [value]
+            balance = _balance_brackets(value)
             while balance > 0 and i < len(lines):
-                buffer = f"{buffer}\n{lines[i]}"
+                line = lines[i]
                 i += 1
-                balance = _balance_brackets(buffer)
-            os.environ[key] = buffer
+                balance += _balance_brackets(line)
+                buffer_parts.append(line)
+            pairs.setdefault(key, "\n".join(buffer_parts))
             continue
 
         cleaned = value.strip()
         if len(cleaned) >= 2 and cleaned[0] == cleaned[-1] and cleaned[0] in ('"', "'"):
             cleaned = cleaned[1:-1]
-        os.environ[key] = cleaned
+        pairs.setdefault(key, cleaned)
+
+    return pairs
+
+
+def _load_env_multiline_json(path: Path) -> None:
+    global _ENV_CACHE
+
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return
+
+    if _ENV_CACHE is not None and _ENV_CACHE[0] == path and _ENV_CACHE[1] == mtime_ns:
+        pairs = _ENV_CACHE[2]
+    else:
+        pairs = _parse_env_lines(path.read_text(encoding="utf-8").splitlines())
+        _ENV_CACHE = (path, mtime_ns, pairs)
+
+    existing = set(os.environ)
+    os.environ.update({key: value for key, value in pairs.items() if key not in existing})
 
 
 @lru_cache
@@ -141,16 +165,16 @@ def get_settings() -> Settings:
 
 
 def get_project_root() -> Path:
-    return Path(__file__).resolve().parents[1]
+    return _PROJECT_ROOT
 
 
 def get_views_dir() -> Path:
-    return get_project_root() / "app" / "views"
+    return _PROJECT_ROOT / "app" / "views"
 
 
 def get_assets_dir() -> Path:
-    return get_project_root() / "app" / "assets"
+    return _PROJECT_ROOT / "app" / "assets"
 
 
 def get_public_dir() -> Path:
-    return get_project_root() / "app" / "public"
+    return _PROJECT_ROOT / "app" / "public"
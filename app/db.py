@@ -2,11 +2,17 @@ from __future__ import annotations
 
 import json
 import sqlite3
-from collections import defaultdict
+import threading
+from collections.abc import Callable
+from contextlib import closing
+from functools import cache
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
 
-from app.config import Settings
+from app.config import Settings, get_project_root
+
+_MIGRATIONS_DIR = get_project_root() / "migrations"
 
 
 def _db_path(settings: Settings) -> Path:
@@ -15,7 +21,22 @@ def _db_path(settings: Settings) -> Path:
     return data_dir / "rsd.sqlite"
 
 
+_local = threading.local()
+
+
 def get_connection(settings: Settings) -> sqlite3.Connection:
+    # One connection per thread and data dir: a shared connection would also share
+    # its transaction state across concurrent requests.
+    connections: dict[str, sqlite3.Connection] | None = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(settings.data_dir)
+    if conn is None:
+        conn = connections[settings.data_dir] = _open_connection(settings)
+    return conn
+
+
+def _open_connection(settings: Settings) -> sqlite3.Connection:
     conn = sqlite3.connect(
         _db_path(settings),
         timeout=30,
@@ -24,11 +45,22 @@ def get_connection(settings: Settings) -> sqlite3.Connection:
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON")
     conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA mmap_size = 268435456")
+    conn.execute("PRAGMA cache_size = -20000")
+    conn.execute("PRAGMA wal_autocheckpoint = 1000")
     return conn
 
 
+@cache
+def _table_columns(db_path: str, table: str) -> tuple[str, ...]:
+    with closing(sqlite3.connect(db_path)) as conn:
+        return tuple(row[1] for row in conn.execute(f"PRAGMA table_info({table})"))
+
+
 def _migrations_dir() -> Path:
-    return Path(__file__).resolve().parents[1] / "migrations"
+    return _MIGRATIONS_DIR
 
 
 def run_migrations(settings: Settings) -> None:
@@ -50,17 +82,16 @@ def run_migrations(settings: Settings) -> None:
             for row in conn.execute("SELECT version FROM schema_migrations").fetchall()
         }
 
+        migrated = False
         for file_path in files:
             version = file_path.name.split("_", 1)[0]
             if version in applied:
                 continue
 
             sql = file_path.read_text(encoding="utf-8")
-            statements = [stmt.strip() for stmt in sql.split(";") if stmt.strip()]
             try:
-                conn.execute("BEGIN")
-                for statement in statements:
-                    conn.execute(statement)
+                # executescript leaves BEGIN open, so the version row joins the same transaction.
+                conn.executescript(f"BEGIN IMMEDIATE;\n{sql}\n;")
                 conn.execute(
                     "INSERT INTO schema_migrations (version) VALUES (?)",
                     (version,),
@@ -69,113 +100,94 @@ def run_migrations(settings: Settings) -> None:
             except Exception:
                 conn.rollback()
                 raise
+            migrated = True
+
+        if migrated:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    _table_columns.cache_clear()
+    _report_upsert.cache_clear()
+    _reports_query.cache_clear()
 
 
 def init_db(settings: Settings) -> None:
     run_migrations(settings)
 
 
+_REPORT_KEY_COLUMNS = ("week_id", "project_slug", "team_slug", "developer_name")
+
+_REPORT_FIELDS: dict[str, Callable[[dict[str, Any]], Any]] = {
+    "week_id": itemgetter("week_id"),
+    "project_slug": itemgetter("project_slug"),
+    "project_name": itemgetter("project_name"),
+    "team_slug": itemgetter("team_slug"),
+    "team_name": itemgetter("team_name"),
+    "developer_name": itemgetter("developer_name"),
+    "summary": itemgetter("summary"),
+    "progress": lambda payload: payload.get("progress", ""),
+    "had_difficulties": lambda payload: int(payload.get("had_difficulties", False)),
+    "difficulties_description": lambda payload: payload.get("difficulties_description", ""),
+    "next_steps": lambda payload: payload.get("next_steps", ""),
+    "had_deliveries": lambda payload: int(payload.get("had_deliveries", False)),
+    "deliveries_notes": lambda payload: payload.get("deliveries_notes", ""),
+    "deliveries_link": lambda payload: payload.get("deliveries_link", ""),
+    "self_assessment": itemgetter("self_assessment"),
+    "next_week_expectation": itemgetter("next_week_expectation"),
+}
+
+# Columns from older schemas, written only when the table still has them.
+_LEGACY_REPORT_FIELDS: dict[str, Callable[[dict[str, Any]], Any]] = {
+    "team": itemgetter("project_name"),
+    "author": itemgetter("developer_name"),
+    "blockers": lambda payload: "",
+    "delivered": lambda payload: payload.get("had_deliveries", 0),
+}
+
+
+@cache
+def _report_upsert(db_path: str) -> tuple[str, tuple[Callable[[dict[str, Any]], Any], ...]]:
+    existing = _table_columns(db_path, "reports")
+    fields = dict(_REPORT_FIELDS)
+    fields.update(
+        (column, getter) for column, getter in _LEGACY_REPORT_FIELDS.items() if column in existing
+    )
+
+    column_sql = ", ".join(fields)
+    placeholders = ", ".join(["?"] * len(fields))
+    update_sql = ", ".join(
+        f"{column} = excluded.{column}" for column in fields if column not in _REPORT_KEY_COLUMNS
+    )
+    sql = f"""
+        INSERT INTO reports ({column_sql}) VALUES ({placeholders})
+        ON CONFLICT (week_id, project_slug, team_slug, developer_name)
+        DO UPDATE SET {update_sql}
+        RETURNING id
+        """
+    return sql, tuple(fields.values())
+
+
 def create_report(settings: Settings, payload: dict[str, Any]) -> int:
-    with get_connection(settings) as conn:
-        existing = {row["name"] for row in conn.execute("PRAGMA table_info(reports)").fetchall()}
+    db_path = str(_db_path(settings))
+    report_sql, report_getters = _report_upsert(db_path)
+    task_cols = _table_columns(db_path, "tasks")
 
-        report_id = None
+    with get_connection(settings) as conn:
+        conn.execute("BEGIN IMMEDIATE")
         row = conn.execute(
-            """
-            SELECT id
-            FROM reports
-            WHERE week_id = ? AND project_slug = ? AND team_slug = ? AND developer_name = ?
-            ORDER BY created_at DESC
-            LIMIT 1
-            """,
-            (
-                payload["week_id"],
-                payload["project_slug"],
-                payload["team_slug"],
-                payload["developer_name"],
-            ),
+            report_sql,
+            tuple(getter(payload) for getter in report_getters),
         ).fetchone()
-        if row:
-            report_id = int(row["id"])
-
-        columns = [
-            "week_id",
-            "project_slug",
-            "project_name",
-            "team_slug",
-            "team_name",
-            "developer_name",
-            "summary",
-            "progress",
-            "had_difficulties",
-            "difficulties_description",
-            "next_steps",
-            "had_deliveries",
-            "deliveries_notes",
-            "deliveries_link",
-            "self_assessment",
-            "next_week_expectation",
-        ]
-        values = [
-            payload["week_id"],
-            payload["project_slug"],
-            payload["project_name"],
-            payload["team_slug"],
-            payload["team_name"],
-            payload["developer_name"],
-            payload["summary"],
-            payload.get("progress", ""),
-            int(payload.get("had_difficulties", False)),
-            payload.get("difficulties_description", ""),
-            payload.get("next_steps", ""),
-            int(payload.get("had_deliveries", False)),
-            payload.get("deliveries_notes", ""),
-            payload.get("deliveries_link", ""),
-            payload["self_assessment"],
-            payload["next_week_expectation"],
-        ]
-
-        if "team" in existing:
-            columns.append("team")
-            values.append(payload["project_name"])
-        if "team_name" in existing:
-            columns.append("team_name")
-            values.append(payload["project_name"])
-        if "author" in existing:
-            columns.append("author")
-            values.append(payload["developer_name"])
-        if "blockers" in existing:
-            columns.append("blockers")
-            values.append("")
-        if "delivered" in existing:
-            columns.append("delivered")
-            values.append(payload.get("had_deliveries", 0))
-
-        if report_id is None:
-            placeholders = ", ".join(["?"] * len(columns))
-            column_sql = ", ".join(columns)
-            cursor = conn.execute(
-                f"INSERT INTO reports ({column_sql}) VALUES ({placeholders})",
-                tuple(values),
-            )
-            report_id = cursor.lastrowid
-        else:
-            set_clause = ", ".join([f"{col} = ?" for col in columns])
-            conn.execute(
-                f"UPDATE reports SET {set_clause} WHERE id = ?",
-                tuple(values + [report_id]),
-            )
-            conn.execute("DELETE FROM tasks WHERE report_id = ?", (report_id,))
+        report_id = int(row["id"])
+        conn.execute("DELETE FROM tasks WHERE report_id = ?", (report_id,))
 
         tasks = payload.get("tasks", [])
-        for task in tasks:
-            task_cols = {row["name"] for row in conn.execute("PRAGMA table_info(tasks)").fetchall()}
+        if tasks:
             if "difficulty" in task_cols:
-                conn.execute(
-                    """
+                task_sql = """
                     INSERT INTO tasks (report_id, task_url, start_date, end_date, days_spent, difficulty)
                     VALUES (?, ?, ?, ?, ?, ?)
-                    """,
+                    """
+                task_rows = [
                     (
                         report_id,
                         task["task_url"],
@@ -183,61 +195,118 @@ def create_report(settings: Settings, payload: dict[str, Any]) -> int:
                         task.get("end_date"),
                         task.get("days_spent"),
                         task.get("difficulty"),
-                    ),
-                )
+                    )
+                    for task in tasks
+                ]
             else:
-                conn.execute(
-                    """
+                task_sql = """
                     INSERT INTO tasks (report_id, task_url, start_date, end_date, days_spent)
                     VALUES (?, ?, ?, ?, ?)
-                    """,
+                    """
+                task_rows = [
                     (
                         report_id,
                         task["task_url"],
                         task["start_date"],
                         task.get("end_date"),
                         task.get("days_spent"),
-                    ),
-                )
+                    )
+                    for task in tasks
+                ]
+            conn.executemany(task_sql, task_rows)
 
         conn.commit()
         return int(report_id)
 
 
-def _hydrate_reports(
+_REPORT_COLUMNS = """
+    *,
+    CASE WHEN json_valid(deliveries_link) THEN json_type(deliveries_link) END
+        AS deliveries_link_type,
+    (
+        SELECT json_group_array(json_object({task_fields}))
+        FROM (
+            SELECT * FROM tasks
+            WHERE tasks.report_id = reports.id
+            ORDER BY created_at ASC, id ASC
+        )
+    ) AS tasks_json
+"""
+
+_Q_GET_REPORT = """
+{select_reports}
+WHERE week_id = ? AND project_slug = ? AND team_slug = ? AND developer_name = ?
+ORDER BY created_at DESC
+LIMIT 1
+"""
+
+# Keyed by (filters on project_slug, filters on team_slug).
+_Q_LIST_WEEK = {
+    (False, False): "{select_reports} WHERE week_id = ? ORDER BY created_at ASC",
+    (True, False): (
+        "{select_reports} WHERE week_id = ? AND project_slug = ? ORDER BY created_at ASC"
+    ),
+    (False, True): "{select_reports} WHERE week_id = ? AND team_slug = ? ORDER BY created_at ASC",
+    (True, True): (
+        "{select_reports} WHERE week_id = ? AND project_slug = ? AND team_slug = ?"
+        " ORDER BY created_at ASC"
+    ),
+}
+
+_Q_LIST_DATE_RANGE = """
+{select_reports}
+WHERE project_slug = ? AND team_slug = ?
+  AND date(created_at) BETWEEN date(?) AND date(?)
+ORDER BY created_at ASC
+"""
+
+_Q_LIST_DATETIME_RANGE = """
+{select_reports}
+WHERE project_slug = ? AND team_slug = ?
+  AND datetime(created_at) BETWEEN datetime(?) AND datetime(?)
+ORDER BY created_at ASC
+"""
+
+
+@cache
+def _reports_query(db_path: str, template: str) -> str:
+    # Tasks are serialized from the live column list, so new task columns reach the API.
+    task_fields = ", ".join(
+        f"'{column}', {column}" for column in _table_columns(db_path, "tasks")
+    )
+    columns = _REPORT_COLUMNS.format(task_fields=task_fields)
+    return template.format(select_reports=f"SELECT {columns} FROM reports")
+
+
+def _fetch_dicts(
     conn: sqlite3.Connection,
-    rows: list[sqlite3.Row],
+    sql: str,
+    params: tuple[Any, ...] = (),
 ) -> list[dict[str, Any]]:
-    if not rows:
-        return []
-
-    report_ids = [row["id"] for row in rows]
-    placeholders = ", ".join(["?"] * len(report_ids))
-
-    tasks_rows = conn.execute(
-        f"SELECT * FROM tasks WHERE report_id IN ({placeholders}) ORDER BY created_at ASC",
-        tuple(report_ids),
-    ).fetchall()
-    tasks_by_report: dict[int, list[dict[str, Any]]] = defaultdict(list)
-    for task in tasks_rows:
-        tasks_by_report[int(task["report_id"])].append(dict(task))
-
-    reports: list[dict[str, Any]] = []
-    for row in rows:
-        report = dict(row)
-        report_id = int(report["id"])
-        report["tasks"] = tasks_by_report.get(report_id, [])
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(sql, params)
+    keys = tuple(column[0] for column in cursor.description)
+    return [dict(zip(keys, row)) for row in cursor.fetchall()]
+
+
+def _hydrate_reports(reports: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    for report in reports:
+        report["tasks"] = json.loads(report.pop("tasks_json") or "[]")
         deliveries_link = report.get("deliveries_link")
+        deliveries_link_type = report.pop("deliveries_link_type", None)
         if isinstance(deliveries_link, str) and deliveries_link.strip():
-            try:
-                parsed = json.loads(deliveries_link)
-                if isinstance(parsed, list):
-                    report["deliveries_links"] = [str(item) for item in parsed if item]
-                    if report["deliveries_links"]:
-                        report["deliveries_link"] = report["deliveries_links"][0]
-            except json.JSONDecodeError:
+            if deliveries_link_type == "array":
+                try:
+                    parsed = json.loads(deliveries_link)
+                except json.JSONDecodeError:
+                    report["deliveries_links"] = [deliveries_link]
+                    continue
+                report["deliveries_links"] = [str(item) for item in parsed if item]
+                if report["deliveries_links"]:
+                    report["deliveries_link"] = report["deliveries_links"][0]
+            elif deliveries_link_type is None:
                 report["deliveries_links"] = [deliveries_link]
-        reports.append(report)
 
     return reports
 
@@ -271,20 +340,14 @@ def get_report(
     developer_name: str,
 ) -> dict[str, Any] | None:
     with get_connection(settings) as conn:
-        row = conn.execute(
-            """
-            SELECT *
-            FROM reports
-            WHERE week_id = ? AND project_slug = ? AND team_slug = ? AND developer_name = ?
-            ORDER BY created_at DESC
-            LIMIT 1
-            """,
+        rows = _fetch_dicts(
+            conn,
+            _reports_query(str(_db_path(settings)), _Q_GET_REPORT),
             (week_id, project_slug, team_slug, developer_name),
-        ).fetchone()
-        if not row:
+        )
+        if not rows:
             return None
-        hydrated = _hydrate_reports(conn, [row])
-        return hydrated[0] if hydrated else None
+        return _hydrate_reports(rows)[0]
 
 
 def list_reports(
@@ -294,22 +357,16 @@ def list_reports(
     team_slug: str | None = None,
 ) -> list[dict[str, Any]]:
     with get_connection(settings) as conn:
-        clauses = ["week_id = ?"]
-        params: list[Any] = [week_id]
+        params: tuple[Any, ...] = (week_id,)
         if project_slug is not None:
-            clauses.append("project_slug = ?")
-            params.append(project_slug)
+            params += (project_slug,)
         if team_slug is not None:
-            clauses.append("team_slug = ?")
-            params.append(team_slug)
+            params += (team_slug,)
 
-        where_sql = " AND ".join(clauses)
-        rows = conn.execute(
-            f"SELECT * FROM reports WHERE {where_sql} ORDER BY created_at ASC",
-            tuple(params),
-        ).fetchall()
+        template = _Q_LIST_WEEK[(project_slug is not None, team_slug is not None)]
+        rows = _fetch_dicts(conn, _reports_query(str(_db_path(settings)), template), params)
 
-        return _hydrate_reports(conn, rows)
+        return _hydrate_reports(rows)
 
 
 def list_teams(settings: Settings, week_id: str, project_slug: str) -> list[str]:
@@ -333,16 +390,13 @@ def list_reports_by_team(
     team_slug: str,
 ) -> list[dict[str, Any]]:
     with get_connection(settings) as conn:
-        rows = conn.execute(
-            """
-            SELECT * FROM reports
-            WHERE week_id = ? AND project_slug = ? AND team_slug = ?
-            ORDER BY created_at ASC
-            """,
+        rows = _fetch_dicts(
+            conn,
+            _reports_query(str(_db_path(settings)), _Q_LIST_WEEK[(True, True)]),
             (week_id, project_slug, team_slug),
-        ).fetchall()
+        )
 
-        return _hydrate_reports(conn, rows)
+        return _hydrate_reports(rows)
 
 
 def list_reports_in_range(
@@ -353,17 +407,13 @@ def list_reports_in_range(
     end_date: str,
 ) -> list[dict[str, Any]]:
     with get_connection(settings) as conn:
-        rows = conn.execute(
-            """
-            SELECT * FROM reports
-            WHERE project_slug = ? AND team_slug = ?
-              AND date(created_at) BETWEEN date(?) AND date(?)
-            ORDER BY created_at ASC
-            """,
+        rows = _fetch_dicts(
+            conn,
+            _reports_query(str(_db_path(settings)), _Q_LIST_DATE_RANGE),
             (project_slug, team_slug, start_date, end_date),
-        ).fetchall()
+        )
 
-        return _hydrate_reports(conn, rows)
+        return _hydrate_reports(rows)
 
 
 def list_reports_in_datetime_range(
@@ -374,14 +424,10 @@ def list_reports_in_datetime_range(
     end_datetime: str,
 ) -> list[dict[str, Any]]:
     with get_connection(settings) as conn:
-        rows = conn.execute(
-            """
-            SELECT * FROM reports
-            WHERE project_slug = ? AND team_slug = ?
-              AND datetime(created_at) BETWEEN datetime(?) AND datetime(?)
-            ORDER BY created_at ASC
-            """,
+        rows = _fetch_dicts(
+            conn,
+            _reports_query(str(_db_path(settings)), _Q_LIST_DATETIME_RANGE),
             (project_slug, team_slug, start_datetime, end_datetime),
-        ).fetchall()
+        )
 
-        return _hydrate_reports(conn, rows)
+        return _hydrate_reports(rows)
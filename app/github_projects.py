@@ -1,16 +1,30 @@
 from __future__ import annotations
 
+import hashlib
 import logging
 import re
+import threading
+import time
 import unicodedata
-from dataclasses import dataclass
-from datetime import date, datetime, timedelta
+from collections import Counter, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import accumulate
 import math
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import requests
 import json
 
+from app.integrations.github import note_rate_limit, wait_for_rate_limit
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 GITHUB_COLORS = {
     "backlog": "#8B949E",
     "blocked": "#f97316",
@@ -22,6 +36,12 @@ GITHUB_COLORS = {
     "open_scope": "#238636",
 }
 
+_PROGRESS_KEYS = ("backlog", "progress", "review", "done")
+_PROGRESS_CATEGORIES = tuple(key.capitalize() for key in _PROGRESS_KEYS)
+_PROGRESS_COLORS = tuple(GITHUB_COLORS[key] for key in _PROGRESS_KEYS)
+_PROGRESS_BUCKETS = frozenset(_PROGRESS_KEYS)
+_FEATURE_EXCLUDED_BUCKETS = frozenset({"cancelled", "duplicate"})
+
 CHART_WIDTH = 800
 CHART_HEIGHT = 280
 CHART_PADDING = 50
@@ -29,10 +49,17 @@ BG_COLOR = "#e6edf3"
 TEXT_COLOR = "#0d1117"
 GRID_COLOR = "#30363d"
 
+GRAPHQL_URL = "https://api.github.com/graphql"
+GRAPHQL_CACHE_TTL = 60.0
+
 logger = logging.getLogger(__name__)
 
+_session = requests.Session()
+_graphql_cache: Dict[str, Tuple[float, dict]] = {}
+_graphql_cache_lock = threading.Lock()
 
-@dataclass
+
+@dataclass(slots=True)
 class ProjectItem:
     id: str
     created_at: datetime
@@ -46,18 +73,23 @@ class ProjectItem:
     estimate_hours: float
     labels: List[str]
     content_type: str = "Issue"
-    repository: str | None = None
     is_archived: bool = False
     content_state_reason: str | None = None
     content_state: str | None = None
     milestone_due: date | None = None
+    status_bucket: str = field(init=False)
+    is_duplicate: bool = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.status_bucket = _bucket_status(self.status)
+        self.is_duplicate = _is_duplicate_item(self)
 
 
 def _parse_datetime(value: str | None) -> datetime | None:
     if not value:
         return None
     try:
-        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        return datetime.fromisoformat(value)
     except ValueError:
         return None
 
@@ -71,67 +103,66 @@ def _parse_date(value: str | None) -> date | None:
         return None
 
 
+@lru_cache(maxsize=1024)
 def _normalize_text(value: str | None) -> str:
     if not value:
         return ""
+    if value.isascii():
+        return value.lower().strip()
     text = unicodedata.normalize("NFKD", value)
-    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = "".join([ch for ch in text if not unicodedata.combining(ch)])
     return text.lower().strip()
 
 
-def _milestone_matches(value: str | None, target: str | None) -> bool:
-    if not value or not target:
-        return False
-    return _normalize_text(target) in _normalize_text(value)
+def _milestone_matches(value: str | None, normalized_target: str) -> bool:
+    return bool(value) and normalized_target in _normalize_text(value)
+
+
+_STATUS_FASTPATH = {
+    "done": "done",
+    "concluído": "done",
+    "concluido": "done",
+    "finalizado": "done",
+    "closed": "done",
+    "entregue": "done",
+    "in review": "review",
+    "in progress": "progress",
+    "em andamento": "progress",
+    "blocked": "blocked",
+    "backlog": "backlog",
+    "todo": "backlog",
+    "to do": "backlog",
+}
+
+# Alternatives are tried in order at position 0, so the first bucket wins exactly like
+# the original if-chain did.
+_STATUS_RE = re.compile(
+    r"(?=.*(?:cancel|suspend|abort|abandon))(?P<cancelled>)"
+    r"|(?=.*duplic)(?P<duplicate>)"
+    r"|(?=done|concl|closed|(?:finalizado|entregue)$)(?P<done>)"
+    r"|(?=.*(?:revis|review|qa|valid))(?P<review>)"
+    r"|(?=.*(?:progres|andamento|doing|wip))(?P<progress>)"
+    r"|(?=.*(?:block|bloq|imped))(?P<blocked>)",
+    re.S,
+)
 
 
+@lru_cache(maxsize=1024)
 def _bucket_status(status: str) -> str:
     normalized = (status or "").strip().lower()
     if not normalized:
         return "no_status"
-
-    if any(k in normalized for k in ["cancel", "suspend", "abort", "abandon"]):
-        return "cancelled"
-
-    if "duplic" in normalized:
-        return "duplicate"
-
-    if normalized in ["done", "concluído", "concluido", "finalizado", "closed", "entregue"]:
-        return "done"
-    if (
-        normalized.startswith("done")
-        or normalized.startswith("concl")
-        or normalized.startswith("closed")
-    ):
-        return "done"
-
-    if (
-        "revis" in normalized
-        or "review" in normalized
-        or "qa" in normalized
-        or "valid" in normalized
-    ):
-        return "review"
-
-    if (
-        "progres" in normalized
-        or "andamento" in normalized
-        or "doing" in normalized
-        or "wip" in normalized
-    ):
-        return "progress"
-
-    if "block" in normalized or "bloq" in normalized or "imped" in normalized:
-        return "blocked"
-
-    return "backlog"
+    bucket = _STATUS_FASTPATH.get(normalized)
+    if bucket is not None:
+        return bucket
+    match = _STATUS_RE.match(normalized)
+    return match.lastgroup if match else "backlog"
 
 
 def _is_duplicate_item(item: ProjectItem) -> bool:
-    if _bucket_status(item.status) == "duplicate":
+    if item.status_bucket == "duplicate":
         return True
-    labels = [l.lower() for l in item.labels]
-    if "duplicate" in labels or "duplicado" in labels:
+    if any(l.lower() in ("duplicate", "duplicado") for l in item.labels):
         return True
     if item.content_state_reason and str(item.content_state_reason).upper() == "DUPLICATE":
         return True
@@ -145,34 +176,68 @@ def _safe_float(value: Any) -> float:
         return 0.0
 
 
+_NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)?", re.A)
+_DIFFICULTY_SCALE = (
+    ("XS", 1.0),
+    ("S", 2.0),
+    ("M", 3.0),
+    ("L", 5.0),
+    ("XL", 8.0),
+    ("P0", 8.0),
+    ("P1", 5.0),
+    ("P2", 3.0),
+    ("P3", 2.0),
+    ("P4", 1.0),
+)
+
+
+@lru_cache(maxsize=1024)
 def _map_difficulty_label(label: str | None) -> float:
     if not label:
         return 0.0
     normalized = label.strip().upper()
-    match = re.search(r"(\d+([\.,]\d+)?)", normalized)
+    match = _NUMBER_RE.search(normalized)
     if match:
-        return _safe_float(match.group(1).replace(",", "."))
-
-    scale_map = {
-        "XS": 1.0,
-        "S": 2.0,
-        "M": 3.0,
-        "L": 5.0,
-        "XL": 8.0,
-        "P0": 8.0,
-        "P1": 5.0,
-        "P2": 3.0,
-        "P3": 2.0,
-        "P4": 1.0,
-    }
-    for key, val in scale_map.items():
+        return _safe_float(match.group(0).replace(",", "."))
+
+    for key, val in _DIFFICULTY_SCALE:
         if normalized.startswith(key):
             return val
     return 0.0
 
 
-def fetch_project_items(token: str, project_id: str) -> List[ProjectItem]:
-    query = """
+def _run_graphql(token: str, query: str, variables: dict[str, Any]) -> dict:
+    key = hashlib.blake2b(
+        json.dumps([token, query, variables], sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    now = time.monotonic()
+    with _graphql_cache_lock:
+        cached = _graphql_cache.get(key)
+        if cached and now - cached[0] < GRAPHQL_CACHE_TTL:
+            return cached[1]
+
+    wait_for_rate_limit()
+    resp = _session.post(
+        GRAPHQL_URL,
+        json={"query": query, "variables": variables},
+        headers={"Authorization": f"Bearer {token}"},
+        timeout=20,
+    )
+    if note_rate_limit(resp.headers) and resp.status_code in {403, 429}:
+        raise requests.RequestException("GitHub rate limit exceeded")
+    resp.raise_for_status()
+    data = orjson.loads(resp.content) if orjson is not None else resp.json()
+
+    if "errors" not in data:
+        with _graphql_cache_lock:
+            expired = [k for k, (ts, _) in _graphql_cache.items() if now - ts >= GRAPHQL_CACHE_TTL]
+            for k in expired:
+                del _graphql_cache[k]
+            _graphql_cache[key] = (now, data)
+    return data
+
+
+_PROJECT_ITEMS_QUERY = """
     query($projectId: ID!, $cursor: String) {
       node(id: $projectId) {
         ... on ProjectV2 {
@@ -187,7 +252,6 @@ def fetch_project_items(token: str, project_id: str) -> List[ProjectItem]:
                   ... on ProjectV2ItemFieldSingleSelectValue { name field { ... on ProjectV2FieldCommon { name } } }
                   ... on ProjectV2ItemFieldNumberValue { number field { ... on ProjectV2FieldCommon { name } } }
                   ... on ProjectV2ItemFieldTextValue { text field { ... on ProjectV2FieldCommon { name } } }
-                  ... on ProjectV2ItemFieldDateValue { date field { ... on ProjectV2FieldCommon { name } } }
                   ... on ProjectV2ItemFieldMilestoneValue { milestone { title dueOn } field { ... on ProjectV2FieldCommon { name } } }
                   ... on ProjectV2ItemFieldIterationValue { 
                     title startDate duration 
@@ -197,9 +261,7 @@ def fetch_project_items(token: str, project_id: str) -> List[ProjectItem]:
               }
                             content {
                                 __typename
-                                ... on Issue { title state stateReason labels(first: 10) { nodes { name } } repository { name } closedAt updatedAt }
-                                ... on PullRequest { title labels(first: 10) { nodes { name } } repository { name } closedAt mergedAt updatedAt }
-                                ... on DraftIssue { title }
+                                ... on Issue { state stateReason labels(first: 10) { nodes { name } } closedAt updatedAt }
                             }
             }
           }
@@ -208,117 +270,126 @@ def fetch_project_items(token: str, project_id: str) -> List[ProjectItem]:
     }
     """
 
+FIELD_STATUS = "Status"
+FIELD_DIFFICULTY = "Dificuldade"
+FIELD_ITERATION = "Iteration"
+FIELD_MILESTONE = "Milestone"
+FIELD_ESTIMATE = "Estimate"
+
+_EXCLUDED_FEATURE_LABEL = _normalize_text("Geração de Relatório")
+
+_FIELD_KEYS = {
+    _normalize_text(FIELD_STATUS): "status",
+    _normalize_text(FIELD_DIFFICULTY): "difficulty",
+    _normalize_text(FIELD_MILESTONE): "milestone",
+    _normalize_text(FIELD_ITERATION): "iteration",
+}
+
+
+def _parse_project_item(node: dict[str, Any], fetched_at: datetime) -> ProjectItem:
+    content = node.get("content") or {}
+    field_values = node.get("fieldValues", {}).get("nodes", [])
+
+    status = ""
+    status_updated_at = None
+    iteration_title = None
+    iteration_start = None
+    iteration_end = None
+    milestone = None
+    milestone_due = None
+    difficulty = 0.0
+    estimate = 0.0
+
+    for fv in field_values:
+        key = _FIELD_KEYS.get(_normalize_text(fv.get("field", {}).get("name", "")))
+        if key is None:
+            continue
+
+        if key == "status":
+            status = fv.get("name") or ""
+
+        elif key == "difficulty":
+            val = fv.get("number")
+            if val is None:
+                val = fv.get("name")
+            if val is None:
+                val = fv.get("text")
+            difficulty = _map_difficulty_label(str(val)) if val else 0.0
+
+        elif key == "milestone":
+            if fv.get("milestone"):
+                milestone = fv.get("milestone", {}).get("title")
+                due_raw = fv.get("milestone", {}).get("dueOn")
+                milestone_due = _parse_date(due_raw) if due_raw else None
+            else:
+                milestone = fv.get("title")
+                milestone_due = None
+
+        elif key == "iteration":
+            iteration_title = fv.get("title")
+            if fv.get("startDate"):
+                iteration_start = _parse_date(fv.get("startDate"))
+                duration = fv.get("duration", 0)
+                iteration_end = iteration_start + timedelta(days=duration)
+
+    lbl_nodes = (content.get("labels") or {}).get("nodes") or []
+    labels = [l.get("name") for l in lbl_nodes if l.get("name")]
+
+    created_at = _parse_datetime(node.get("createdAt")) or fetched_at
+
+    content_closed_at = None
+    content_updated_at = None
+    if content.get("__typename") == "Issue":
+        content_closed_at = _parse_datetime(content.get("closedAt"))
+        content_updated_at = _parse_datetime(content.get("updatedAt"))
+
+    return ProjectItem(
+        id=node.get("id"),
+        created_at=created_at,
+        status=status,
+        status_updated_at=(content_closed_at or content_updated_at),
+        iteration_title=iteration_title,
+        iteration_start=iteration_start,
+        iteration_end=iteration_end,
+        milestone=milestone,
+        milestone_due=milestone_due,
+        difficulty=difficulty,
+        estimate_hours=estimate,
+        labels=labels,
+        content_type=content.get("__typename", "Issue"),
+        is_archived=node.get("isArchived", False),
+        content_state_reason=content.get("stateReason"),
+        content_state=content.get("state"),
+    )
+
+
+def fetch_project_items(token: str, project_id: str) -> List[ProjectItem]:
     items = []
-    cursor = None
+    fetched_at = datetime.now(timezone.utc)
 
-    FIELD_STATUS = "Status"
-    FIELD_DIFFICULTY = "Dificuldade"
-    FIELD_ITERATION = "Iteration"
-    FIELD_MILESTONE = "Milestone"
-    FIELD_ESTIMATE = "Estimate"
+    def _fetch_page(cursor: str | None) -> Future:
+        return pool.submit(
+            _run_graphql, token, _PROJECT_ITEMS_QUERY, {"projectId": project_id, "cursor": cursor}
+        )
 
-    while True:
-        try:
-            resp = requests.post(
-                "https://api.github.com/graphql",
-                json={"query": query, "variables": {"projectId": project_id, "cursor": cursor}},
-                headers={"Authorization": f"Bearer {token}"},
-                timeout=20,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-        except Exception as e:
-            logger.error(f"Failed to fetch GitHub items: {e}")
-            break
-
-        nodes = data.get("data", {}).get("node", {}).get("items", {}).get("nodes", [])
-        page_info = data.get("data", {}).get("node", {}).get("items", {}).get("pageInfo", {})
-
-        for node in nodes:
-            content = node.get("content") or {}
-            field_values = node.get("fieldValues", {}).get("nodes", [])
-
-            status = ""
-            status_updated_at = None
-            iteration_title = None
-            iteration_start = None
-            iteration_end = None
-            milestone = None
-            milestone_due = None
-            difficulty = 0.0
-            estimate = 0.0
-
-            for fv in field_values:
-                f_name = fv.get("field", {}).get("name", "")
-
-                if _normalize_text(f_name) == _normalize_text(FIELD_STATUS):
-                    status = fv.get("name") or ""
-
-                elif _normalize_text(f_name) == _normalize_text(FIELD_DIFFICULTY):
-                    val = fv.get("number")
-                    if val is None:
-                        val = fv.get("name")
-                    if val is None:
-                        val = fv.get("text")
-                    difficulty = _map_difficulty_label(str(val)) if val else 0.0
-
-                elif _normalize_text(f_name) == _normalize_text(FIELD_MILESTONE):
-                    if fv.get("milestone"):
-                        milestone = fv.get("milestone", {}).get("title")
-                        due_raw = fv.get("milestone", {}).get("dueOn")
-                        milestone_due = _parse_date(due_raw) if due_raw else None
-                    else:
-                        milestone = fv.get("title")
-                        milestone_due = None
-
-                elif _normalize_text(f_name) == _normalize_text(FIELD_ITERATION):
-                    iteration_title = fv.get("title")
-                    if fv.get("startDate"):
-                        iteration_start = _parse_date(fv.get("startDate"))
-                        duration = fv.get("duration", 0)
-                        iteration_end = iteration_start + timedelta(days=duration)
-
-            labels = []
-            lbl_nodes = (content.get("labels") or {}).get("nodes") or []
-            labels = [l.get("name") for l in lbl_nodes if l.get("name")]
-
-            created_at = _parse_datetime(node.get("createdAt")) or datetime.now()
-
-            content_closed_at = None
-            content_updated_at = None
-            if content.get("__typename") == "Issue":
-                content_closed_at = _parse_datetime(content.get("closedAt"))
-                content_updated_at = _parse_datetime(content.get("updatedAt"))
-            elif content.get("__typename") == "PullRequest":
-                content_closed_at = _parse_datetime(
-                    content.get("closedAt") or content.get("mergedAt")
-                )
-                content_updated_at = _parse_datetime(content.get("updatedAt"))
-
-            item = ProjectItem(
-                id=node.get("id"),
-                created_at=created_at,
-                status=status,
-                status_updated_at=(content_closed_at or content_updated_at),
-                iteration_title=iteration_title,
-                iteration_start=iteration_start,
-                iteration_end=iteration_end,
-                milestone=milestone,
-                milestone_due=milestone_due,
-                difficulty=difficulty,
-                estimate_hours=estimate,
-                labels=labels,
-                content_type=content.get("__typename", "Issue"),
-                repository=(content.get("repository") or {}).get("name"),
-                is_archived=node.get("isArchived", False),
-                content_state_reason=content.get("stateReason"),
-                content_state=content.get("state"),
-            )
-            items.append(item)
+    # The next page is requested before the current one is parsed, so parsing overlaps the
+    # round trip of the following request.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending: Future | None = _fetch_page(None)
+        while pending is not None:
+            try:
+                data = pending.result()
+            except Exception as e:
+                logger.error(f"Failed to fetch GitHub items: {e}")
+                break
+
+            nodes = data.get("data", {}).get("node", {}).get("items", {}).get("nodes", [])
+            page_info = data.get("data", {}).get("node", {}).get("items", {}).get("pageInfo", {})
 
-        if not page_info.get("hasNextPage"):
-            break
-        cursor = page_info.get("endCursor")
+            pending = None
+            if page_info.get("hasNextPage"):
+                pending = _fetch_page(page_info.get("endCursor"))
+            items.extend(_parse_project_item(node, fetched_at) for node in nodes)
 
     return items
 
@@ -346,71 +417,62 @@ def _burnup_chart_svg(
     raw_max = max(max(scope_series), 1)
     max_y = math.ceil(raw_max * 1.05 / 50) * 50
 
-    def get_y(val):
-        return height - pad - (val / max_y * (height - 2 * pad))
-
-    def get_x(idx):
-        return pad + (idx / (len(dates) - 1) * (width - 2 * pad))
-
-    scope_points = []
-    completed_points = []
-    duplicate_points = []
-
-    for i, d in enumerate(dates):
-        x = get_x(i)
-        y_scope = get_y(scope_series[i])
-        y_done = get_y(completed_series[i])
-        y_dup = get_y(duplicate_series[i]) if duplicate_series else get_y(0)
-        scope_points.append(f"{x:.1f},{y_scope:.1f}")
-        completed_points.append(f"{x:.1f},{y_done:.1f}")
-        duplicate_points.append(f"{x:.1f},{y_dup:.1f}")
-
-    done_area_path = (
-        f"M {pad},{height - pad} "
-        + " ".join([f"L {p}" for p in completed_points])
-        + f" L {get_x(len(dates) - 1)},{height - pad} Z"
-    )
+    base_y = height - pad
+    plot_h = height - 2 * pad
+    plot_w = width - 2 * pad
+    last_i = max(len(dates) - 1, 1)
+    xs = [f"{pad + (i / last_i * plot_w):.1f}" for i in range(len(dates))]
 
-    scope_area_path = (
-        f"M {pad},{height - pad} "
-        + " ".join([f"L {p}" for p in scope_points])
-        + f" L {get_x(len(dates) - 1)},{height - pad} Z"
-    )
+    def _points(series: List[float]) -> List[str]:
+        return [f"{x},{base_y - (val / max_y * plot_h):.1f}" for x, val in zip(xs, series)]
+
+    scope_points = _points(scope_series)
+    completed_points = _points(completed_series)
+    duplicate_points = _points(duplicate_series or [0] * len(dates))
+
+    scope_color = GITHUB_COLORS["open_scope"]
+    done_color = GITHUB_COLORS["done"]
 
-    dup_line = f"M " + " ".join([f"{p}" for p in duplicate_points])
+    last_x = float(pad + plot_w)
+    area_start = f"M {pad},{base_y} L "
+    area_end = f" L {last_x},{base_y} Z"
+    done_area_path = area_start + " L ".join(completed_points) + area_end
+    scope_area_path = area_start + " L ".join(scope_points) + area_end
 
-    scope_line = f"M " + " ".join([f"{p}" for p in scope_points])
-    done_line = f"M " + " ".join([f"{p}" for p in completed_points])
-    dup_line = dup_line
+    scope_line = "M " + " ".join(scope_points)
+    done_line = "M " + " ".join(completed_points)
+    dup_line = "M " + " ".join(duplicate_points)
 
-    x_labels_svg = ""
+    x_labels: List[str] = []
     step = max(1, len(dates) // 8)
     for i in range(0, len(dates), step):
-        x_labels_svg += f'<text x="{get_x(i):.1f}" y="{height - pad + 20}" font-size="10" fill="{TEXT_COLOR}" text-anchor="middle">{dates[i].strftime("%d/%b")}</text>'
+        x_labels.append(f'<text x="{xs[i]}" y="{height - pad + 20}" font-size="10" fill="{TEXT_COLOR}" text-anchor="middle">{dates[i].strftime("%d/%b")}</text>')
 
-    last_idx = len(dates) - 1
-    last_x = get_x(last_idx)
     last_scope_val = scope_series[-1] if scope_series else 0
     last_done_val = completed_series[-1] if completed_series else 0
-    last_dup_val = duplicate_series[-1] if (duplicate_series and len(duplicate_series) > 0) else 0
-    last_scope_y = get_y(last_scope_val)
-    last_done_y = get_y(last_done_val)
+    last_dup_val = duplicate_series[-1] if duplicate_series else 0
+    last_scope_y = base_y - (last_scope_val / max_y * plot_h)
+    last_done_y = base_y - (last_done_val / max_y * plot_h)
+    last_dup_y = base_y - (last_dup_val / max_y * plot_h)
     display_scope = int(final_open) if final_open is not None else int(last_scope_val)
     display_done = int(final_done) if final_done is not None else int(last_done_val)
     last_values_svg = (
-        f'<text x="{last_x + 8:.1f}" y="{last_scope_y - 6:.1f}" font-size="11" fill="{GITHUB_COLORS["open_scope"]}" font-weight="600">{display_scope}</text>'
-        + f'<text x="{last_x + 8:.1f}" y="{last_done_y + 4:.1f}" font-size="11" fill="{GITHUB_COLORS["done"]}" font-weight="600">{display_done}</text>'
-        + f'<text x="{last_x + 8:.1f}" y="{get_y(last_dup_val) + 14:.1f}" font-size="11" fill="#9ca3af" font-weight="600">{int(final_dup) if final_dup is not None else int(last_dup_val)}</text>'
+        f'<text x="{last_x + 8:.1f}" y="{last_scope_y - 6:.1f}" font-size="11" fill="{scope_color}" font-weight="600">{display_scope}</text>'
+        + f'<text x="{last_x + 8:.1f}" y="{last_done_y + 4:.1f}" font-size="11" fill="{done_color}" font-weight="600">{display_done}</text>'
+        + f'<text x="{last_x + 8:.1f}" y="{last_dup_y + 14:.1f}" font-size="11" fill="#9ca3af" font-weight="600">{int(final_dup) if final_dup is not None else int(last_dup_val)}</text>'
     )
 
     legend_items = [("open_scope", "Open Scope"), ("done", "Completed"), ("duplicate", "Duplicate")]
-    legend_svg = ""
+    legend_parts: List[str] = []
     for idx, (key, label) in enumerate(legend_items):
         cx = width - 360 + idx * 90
         tx = width - 350 + idx * 90
         color = GITHUB_COLORS.get(key, "#9ca3af")
-        legend_svg += f'<circle cx="{cx:.0f}" cy="30" r="4" fill="{color}"/>'
-        legend_svg += f'<text x="{tx:.0f}" y="34" font-size="12" fill="{TEXT_COLOR}">{label}</text>'
+        legend_parts.append(f'<circle cx="{cx:.0f}" cy="30" r="4" fill="{color}"/>')
+        legend_parts.append(f'<text x="{tx:.0f}" y="34" font-size="12" fill="{TEXT_COLOR}">{label}</text>')
+
+    x_labels_svg = "".join(x_labels)
+    legend_svg = "".join(legend_parts)
 
     return f"""
     <svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">
@@ -422,11 +484,11 @@ def _burnup_chart_svg(
         <text x="{pad - 10}" y="{pad}" font-size="10" fill="{TEXT_COLOR}" text-anchor="end">{int(max_y)}</text>
         <text x="{pad - 10}" y="{height - pad}" font-size="10" fill="{TEXT_COLOR}" text-anchor="end">0</text>
         
-        <path d="{scope_area_path}" fill="{GITHUB_COLORS["open_scope"]}" opacity="0.2"/>
-        <path d="{done_area_path}" fill="{GITHUB_COLORS["done"]}" opacity="0.3"/>
+        <path d="{scope_area_path}" fill="{scope_color}" opacity="0.2"/>
+        <path d="{done_area_path}" fill="{done_color}" opacity="0.3"/>
 
-        <path d="{scope_line}" fill="none" stroke="{GITHUB_COLORS["open_scope"]}" stroke-width="2"/>
-        <path d="{done_line}" fill="none" stroke="{GITHUB_COLORS["done"]}" stroke-width="2"/>
+        <path d="{scope_line}" fill="none" stroke="{scope_color}" stroke-width="2"/>
+        <path d="{done_line}" fill="none" stroke="{done_color}" stroke-width="2"/>
         <path d="{dup_line}" fill="none" stroke="#9ca3af" stroke-width="2" stroke-dasharray="4 4" opacity="0.9"/>
         
         {x_labels_svg}
@@ -463,7 +525,7 @@ def _horizontal_stacked_bar_svg(
     max_total = max(max_total, 1)
     scale_x = (width - left_margin - CHART_PADDING) / max_total
 
-    bars_svg = ""
+    bar_parts: List[str] = []
     status_order = [
         "done",
         "review",
@@ -471,12 +533,13 @@ def _horizontal_stacked_bar_svg(
         "backlog",
     ]
     plot_order = ["backlog", "progress", "review", "done"]
+    colors_by_st = {st: GITHUB_COLORS.get(st, "#333") for st in plot_order}
 
     for i, label in enumerate(labels):
         y = top_margin + i * (bar_height + gap)
         vals = data[label]
 
-        bars_svg += f'<text x="{left_margin - 10}" y="{y + 14}" font-size="11" fill="{TEXT_COLOR}" text-anchor="end">{label[:40]}</text>'
+        bar_parts.append(f'<text x="{left_margin - 10}" y="{y + 14}" font-size="11" fill="{TEXT_COLOR}" text-anchor="end">{label[:40]}</text>')
 
         current_x = left_margin
 
@@ -489,18 +552,19 @@ def _horizontal_stacked_bar_svg(
                 val = 0.0
             if val > 0:
                 seg_width = val * scale_x
-                color = GITHUB_COLORS.get(st, "#333")
-                bars_svg += f'<rect x="{current_x}" y="{y}" width="{seg_width}" height="{bar_height}" fill="{color}" rx="2"/>'
+                bar_parts.append(f'<rect x="{current_x}" y="{y}" width="{seg_width}" height="{bar_height}" fill="{colors_by_st[st]}" rx="2"/>')
                 if seg_width > 15:
-                    bars_svg += f'<text x="{current_x + seg_width / 2}" y="{y + 14}" font-size="9" fill="white" text-anchor="middle">{int(val)}</text>'
+                    bar_parts.append(f'<text x="{current_x + seg_width / 2}" y="{y + 14}" font-size="9" fill="white" text-anchor="middle">{int(val)}</text>')
                 current_x += seg_width
 
-    legend_svg = ""
+    legend_parts: List[str] = []
     lx = width - 250
     for idx, st in enumerate(plot_order):
-        c = GITHUB_COLORS.get(st)
-        legend_svg += f'<rect x="{lx + idx * 60}" y="20" width="10" height="10" fill="{c}" rx="2"/>'
-        legend_svg += f'<text x="{lx + idx * 60 + 14}" y="29" font-size="10" fill="{TEXT_COLOR}">{st.capitalize()}</text>'
+        legend_parts.append(f'<rect x="{lx + idx * 60}" y="20" width="10" height="10" fill="{colors_by_st[st]}" rx="2"/>')
+        legend_parts.append(f'<text x="{lx + idx * 60 + 14}" y="29" font-size="10" fill="{TEXT_COLOR}">{st.capitalize()}</text>')
+
+    legend_svg = "".join(legend_parts)
+    bars_svg = "".join(bar_parts)
 
     return f"""
     <svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{chart_h}" viewBox="0 0 {width} {chart_h}">
@@ -512,24 +576,36 @@ def _horizontal_stacked_bar_svg(
 
 
 def _simple_bar_chart_svg(
-    categories: List[str], values: List[float], colors: List[str], title: str, y_label: str
+    categories: Sequence[str],
+    values: List[float],
+    colors: Sequence[str],
+    title: str,
+    y_label: str,
 ) -> str:
     width, height = CHART_WIDTH, CHART_HEIGHT
     pad = CHART_PADDING
 
     max_val = max(max(values), 1)
-    bar_w = (width - 2 * pad) / len(categories) * 0.6
-    gap = (width - 2 * pad) / len(categories) * 0.4
-
-    bars = ""
-    for i, (cat, val) in enumerate(zip(categories, values)):
-        h = (val / max_val) * (height - 2 * pad)
-        x = pad + i * (bar_w + gap) + gap / 2
-        y = height - pad - h
-
-        bars += f'<rect x="{x}" y="{y}" width="{bar_w}" height="{h}" fill="{colors[i]}" rx="4"/>'
-        bars += f'<text x="{x + bar_w / 2}" y="{y - 5}" font-size="11" fill="{TEXT_COLOR}" text-anchor="middle" font-weight="bold">{int(val) if val.is_integer() else f"{val:.1f}"}</text>'
-        bars += f'<text x="{x + bar_w / 2}" y="{height - pad + 15}" font-size="11" fill="{TEXT_COLOR}" text-anchor="middle">{cat}</text>'
+    base_y = height - pad
+    plot_h = height - 2 * pad
+    slot_w = (width - 2 * pad) / len(categories)
+    bar_w = slot_w * 0.6
+    gap = slot_w * 0.4
+    step = bar_w + gap
+    half_bar = bar_w / 2
+
+    bar_parts: List[str] = []
+    for i, (cat, val, color) in enumerate(zip(categories, values, colors)):
+        h = (val / max_val) * plot_h
+        x = pad + i * step + gap / 2
+        y = base_y - h
+        label = int(val) if val == int(val) else f"{val:.1f}"
+
+        bar_parts.append(f'<rect x="{x}" y="{y}" width="{bar_w}" height="{h}" fill="{color}" rx="4"/>')
+        bar_parts.append(f'<text x="{x + half_bar}" y="{y - 5}" font-size="11" fill="{TEXT_COLOR}" text-anchor="middle" font-weight="bold">{label}</text>')
+        bar_parts.append(f'<text x="{x + half_bar}" y="{base_y + 15}" font-size="11" fill="{TEXT_COLOR}" text-anchor="middle">{cat}</text>')
+
+    bars = "".join(bar_parts)
 
     return f"""
     <svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">
@@ -552,8 +628,12 @@ def load_project_charts(
         reference_date = date.today()
 
     raw_items = fetch_project_items(token, project_id)
+    milestone_target = _normalize_text(milestone_month) if milestone_month else None
 
     active_items: List[ProjectItem] = []
+    created_days: List[date] = []
+    earliest_due: date | None = None
+    earliest_created: date | None = None
     for item in raw_items:
         if item.is_archived:
             continue
@@ -561,84 +641,100 @@ def load_project_charts(
             continue
         if item.content_type == "PullRequest":
             continue
-        if _bucket_status(item.status) == "cancelled":
+        if item.status_bucket == "cancelled":
             continue
         if item.content_state_reason and str(item.content_state_reason).upper() == "NOT_PLANNED":
             continue
-        if milestone_month and not _milestone_matches(item.milestone, milestone_month):
+        if milestone_target is not None and not _milestone_matches(
+            item.milestone, milestone_target
+        ):
             continue
         active_items.append(item)
+        if item.milestone_due and (earliest_due is None or item.milestone_due < earliest_due):
+            earliest_due = item.milestone_due
+        created_day = item.created_at.date()
+        created_days.append(created_day)
+        if earliest_created is None or created_day < earliest_created:
+            earliest_created = created_day
 
     if not active_items:
         return {}
 
-    milestone_dues = [it.milestone_due for it in active_items if getattr(it, "milestone_due", None)]
-    end_date = min(milestone_dues) if milestone_dues else reference_date
-    created_dates = [it.created_at.date() for it in active_items if getattr(it, "created_at", None)]
-    start_date = min(created_dates) if created_dates else (end_date - timedelta(days=30))
+    end_date = earliest_due or reference_date
+    start_date = earliest_created or (end_date - timedelta(days=30))
     if start_date > end_date:
         start_date = end_date - timedelta(days=30)
 
-    events_pts: List[Tuple[date, str, float]] = []
-    for item in active_items:
-        try:
-            created_day = item.created_at.date()
-        except Exception:
-            continue
+    span = (end_date - start_date).days + 1
+    scope_by_day = [0.0] * span
+    done_by_day = [0.0] * span
+    dup_by_day = [0.0] * span
+    total_scope_pts = total_done_pts = total_dup_pts = 0.0
+    status_points_total = {k: 0.0 for k in GITHUB_COLORS}
+    status_counts_total = {k: 0 for k in GITHUB_COLORS}
+
+    # Iteration snapshot: items whose iteration ended by the cutoff, bucketed as of that day.
+    cutoff = reference_date
+    count_totals: Dict[str, int] = {
+        k: 0 for k in ["backlog", "blocked", "progress", "review", "done", "duplicate"]
+    }
+    difficulty_totals: Dict[str, float] = {
+        k: 0.0 for k in ["backlog", "blocked", "progress", "review", "done", "duplicate"]
+    }
+    selected_count = 0
+
+    for item, created_day in zip(active_items, created_days):
+        bucket = item.status_bucket
+        is_dup_item = item.is_duplicate
+        diff = item.difficulty
+        updated_day = item.status_updated_at.date() if item.status_updated_at else None
+
+        if is_dup_item:
+            total_dup_pts += diff
+            status_points_total["duplicate"] += diff
+            status_counts_total["duplicate"] += 1
+        else:
+            if bucket == "done":
+                total_done_pts += diff
+            status_points_total[bucket] += diff
+            status_counts_total[bucket] += 1
+
+        if (
+            item.iteration_start
+            and item.iteration_end
+            and item.iteration_end <= cutoff
+            and not (bucket == "backlog" and item.content_state == "CLOSED")
+        ):
+            if is_dup_item and updated_day and updated_day <= cutoff and bucket == "done":
+                key = "done"
+            elif is_dup_item:
+                key = "duplicate" if (updated_day or created_day) <= cutoff else "backlog"
+            elif updated_day and updated_day > cutoff:
+                key = "backlog"
+            else:
+                key = bucket if bucket in _PROGRESS_BUCKETS else "backlog"
+            count_totals[key] += 1
+            difficulty_totals[key] += float(diff or 0.0)
+            selected_count += 1
+
         if created_day > end_date:
             continue
-        events_pts.append((created_day, "scope", item.difficulty))
+        total_scope_pts += diff
+        # Events before the window start land on its first day.
+        scope_by_day[max((created_day - start_date).days, 0)] += diff
 
-        is_dup_item = _is_duplicate_item(item)
-
-        is_done_column = _bucket_status(item.status) == "done"
-        if is_done_column and item.status_updated_at and not is_dup_item:
-            done_day = item.status_updated_at.date()
-            if done_day <= end_date:
-                events_pts.append((done_day, "done", item.difficulty))
+        if bucket == "done" and not is_dup_item and updated_day and updated_day <= end_date:
+            done_by_day[max((updated_day - start_date).days, 0)] += diff
 
         if is_dup_item:
-            dup_day = (item.status_updated_at or item.created_at).date()
+            dup_day = updated_day or created_day
             if dup_day <= end_date:
-                events_pts.append((dup_day, "dup", item.difficulty))
-
-    events_pts.sort(key=lambda x: x[0])
-
-    burnup_dates: List[date] = []
-    burnup_scope_pts: List[float] = []
-    burnup_done_pts: List[float] = []
-    burnup_dup_pts: List[float] = []
-
-    scope_acc = done_acc = dup_acc = 0.0
-    curr_date = start_date
-    idx = 0
-    while curr_date <= end_date:
-        while idx < len(events_pts) and events_pts[idx][0] <= curr_date:
-            _, tipo, val = events_pts[idx]
-            if tipo == "scope":
-                scope_acc += val
-            elif tipo == "done":
-                done_acc += val
-            elif tipo == "dup":
-                dup_acc += val
-            idx += 1
-
-        burnup_dates.append(curr_date)
-        burnup_scope_pts.append(scope_acc)
-        burnup_done_pts.append(done_acc)
-        burnup_dup_pts.append(dup_acc)
-        curr_date += timedelta(days=1)
-
-    def _is_strictly_done(it: ProjectItem) -> bool:
-        if _bucket_status(it.status) == "done":
-            return True
-        return False
-
-    total_scope_pts = sum(it.difficulty for it in active_items if it.created_at.date() <= end_date)
-    total_dup_pts = sum(it.difficulty for it in active_items if _is_duplicate_item(it))
-    total_done_pts = sum(
-        it.difficulty for it in active_items if _is_strictly_done(it) and not _is_duplicate_item(it)
-    )
+                dup_by_day[max((dup_day - start_date).days, 0)] += diff
+
+    burnup_dates = [start_date + timedelta(days=i) for i in range(span)]
+    burnup_scope_pts = list(accumulate(scope_by_day))
+    burnup_done_pts = list(accumulate(done_by_day))
+    burnup_dup_pts = list(accumulate(dup_by_day))
 
     if burnup_scope_pts:
         burnup_scope_pts[-1] = total_scope_pts
@@ -662,81 +758,13 @@ def load_project_charts(
         final_dup=final_dup_display,
     )
 
-    cutoff = reference_date or date.today()
-
-    baseline_items = [
-        it
-        for it in active_items
-        if not (
-            _bucket_status(it.status) == "backlog"
-            and getattr(it, "content_state", None) == "CLOSED"
-        )
-    ]
-
-    iter_items = [
-        it
-        for it in baseline_items
-        if getattr(it, "iteration_start", None) and getattr(it, "iteration_end", None)
-    ]
-    items_cut = [it for it in iter_items if it.iteration_end <= cutoff]
-
-    count_totals: Dict[str, int] = {
-        k: 0 for k in ["backlog", "blocked", "progress", "review", "done", "duplicate"]
-    }
-    difficulty_totals: Dict[str, float] = {
-        k: 0.0 for k in ["backlog", "blocked", "progress", "review", "done", "duplicate"]
-    }
-
-    for it in items_cut:
-        sk = _bucket_status(it.status)
-        if sk == "cancelled":
-            continue
-        is_dup_flag = _is_duplicate_item(it)
-
-        if (
-            is_dup_flag
-            and getattr(it, "status_updated_at", None)
-            and it.status_updated_at.date() <= cutoff
-            and _bucket_status(it.status) == "done"
-        ):
-            count_totals["done"] += 1
-            difficulty_totals["done"] += float(it.difficulty or 0.0)
-            continue
-
-        if is_dup_flag:
-            day = (it.status_updated_at or it.created_at).date()
-            if day <= cutoff:
-                count_totals["duplicate"] += 1
-                difficulty_totals["duplicate"] += float(it.difficulty or 0.0)
-            else:
-                count_totals["backlog"] += 1
-                difficulty_totals["backlog"] += float(it.difficulty or 0.0)
-            continue
-
-        if getattr(it, "status_updated_at", None) and it.status_updated_at.date() > cutoff:
-            count_totals["backlog"] += 1
-            difficulty_totals["backlog"] += float(it.difficulty or 0.0)
-        else:
-            key = sk if sk in ["backlog", "progress", "review", "done"] else "backlog"
-            count_totals[key] += 1
-            difficulty_totals[key] += float(it.difficulty or 0.0)
-
-    prog_cats = ["Backlog", "Progress", "Review", "Done"]
-    prog_vals_points = [
-        difficulty_totals["backlog"],
-        difficulty_totals["progress"],
-        difficulty_totals["review"],
-        difficulty_totals["done"],
-    ]
-    prog_cols = [
-        GITHUB_COLORS["backlog"],
-        GITHUB_COLORS["progress"],
-        GITHUB_COLORS["review"],
-        GITHUB_COLORS["done"],
-    ]
-
+    prog_vals_points = [difficulty_totals[key] for key in _PROGRESS_KEYS]
     progress_svg = _simple_bar_chart_svg(
-        prog_cats, prog_vals_points, prog_cols, "Progresso Atual (Previsto)", "Pontos"
+        _PROGRESS_CATEGORIES,
+        prog_vals_points,
+        _PROGRESS_COLORS,
+        "Progresso Atual (Previsto)",
+        "Pontos",
     )
 
     categories = ["backlog", "blocked", "progress", "review", "done"]
@@ -758,51 +786,34 @@ def load_project_charts(
             )
         ),
         "difficulty_points": {k: difficulty_totals.get(k, 0.0) for k in difficulty_totals.keys()},
-        "selected_count": len(items_cut),
+        "selected_count": selected_count,
     }
 
-    label_map: Dict[str, Dict[str, int]] = {}
+    label_map: Dict[str, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(_PROGRESS_KEYS, 0))
     ref_date = reference_date or date.today()
 
-    filtered_items = [
-        it
-        for it in active_items
-        if getattr(it, "iteration_start", None)
-        and it.created_at.date() <= ref_date
-        and _bucket_status(it.status) not in ["cancelled", "duplicate"]
-    ]
+    label_status_counts = Counter(
+        (lbl, item.status_bucket if item.status_bucket in _PROGRESS_BUCKETS else "backlog")
+        for item, created_day in zip(active_items, created_days)
+        if item.iteration_start
+        and created_day <= ref_date
+        and item.status_bucket not in _FEATURE_EXCLUDED_BUCKETS
+        for lbl in item.labels
+    )
+    for (lbl, st), count in label_status_counts.items():
+        label_map[lbl][st] = count
 
-    for item in filtered_items:
-        st = _bucket_status(item.status)
-        if st not in ["backlog", "progress", "review", "done"]:
-            st = "backlog"
-        for lbl in item.labels:
-            if lbl not in label_map:
-                label_map[lbl] = {"backlog": 0, "progress": 0, "review": 0, "done": 0}
-            label_map[lbl][st] = label_map[lbl].get(st, 0) + 1
-
-    sorted_labels = sorted(label_map.items(), key=lambda x: sum(x[1].values()), reverse=True)
-    exclude_norm = _normalize_text("Geração de Relatório")
-    filtered_sorted = [(k, v) for (k, v) in sorted_labels if _normalize_text(k) != exclude_norm]
-    top_labels = [k for k, v in filtered_sorted]
+    label_totals = {
+        lbl: sum(counts.values())
+        for lbl, counts in label_map.items()
+        if _normalize_text(lbl) != _EXCLUDED_FEATURE_LABEL
+    }
+    top_labels = sorted(label_totals, key=label_totals.__getitem__, reverse=True)
     features_data = {lbl: label_map[lbl] for lbl in top_labels}
     features_svg = _horizontal_stacked_bar_svg(
         top_labels, features_data, f"Features - {milestone_label or milestone_month}"
     )
 
-    status_points_total = {k: 0.0 for k in GITHUB_COLORS}
-    status_counts_total = {k: 0 for k in GITHUB_COLORS}
-    for item in active_items:
-        st = _bucket_status(item.status)
-        if st == "cancelled":
-            continue
-        if st == "duplicate" or _is_duplicate_item(item):
-            status_points_total["duplicate"] += item.difficulty
-            status_counts_total["duplicate"] += 1
-            continue
-        status_points_total[st] += item.difficulty
-        status_counts_total[st] += 1
-
     total_pts = sum(status_points_total.values())
     total_cnt = sum(status_counts_total.values())
 
@@ -1,42 +1,93 @@
 from __future__ import annotations
 
+import hashlib
 import logging
+import re
+import threading
 import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Optional
-from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 _auth_failed = False
 
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+
+_NUMBER_RE = re.compile(r"-?\d+(?:[.,]\d+)?", re.A)
+_BODY_DIFFICULTY_RE = re.compile(r"dificuldade[:\s]*([XSMLP0-9.,]+)", re.I)
+_GITHUB_URL_RE = re.compile(
+    r"(?i:https?)://[^/?#]*/+([^/?#]+)/+([^/?#]+)/+(?:issues|pulls?)/+(\d+)(?:[/?#;].*)?",
+    re.S,
+)
+
 
 def parse_github_url(url: str) -> tuple[str, str, int]:
-    parsed = urlparse(url.strip())
-    if parsed.scheme not in {"http", "https"}:
+    match = _GITHUB_URL_RE.fullmatch(url.strip())
+    if not match:
         raise ValueError("Invalid GitHub issue/PR URL")
+    owner, repo, number_raw = match.groups()
+    return owner, repo.removesuffix(".git"), int(number_raw)
 
-    path = parsed.path.strip("/")
-    parts = [part for part in path.split("/") if part]
-    if len(parts) < 4:
-        raise ValueError("Invalid GitHub issue/PR URL")
 
-    owner, repo, kind, number_raw = parts[0], parts[1], parts[2], parts[3]
-    repo = repo.removesuffix(".git")
-    if kind not in {"issues", "pull", "pulls"}:
-        raise ValueError("Invalid GitHub issue/PR URL")
-    if not number_raw.isdigit():
-        raise ValueError("Invalid GitHub issue/PR URL")
+def _decode_json(response: requests.Response) -> dict:
+    return orjson.loads(response.content) if orjson else response.json()
+
 
-    return owner, repo, int(number_raw)
+@lru_cache(maxsize=8)
+def github_headers(token: str) -> Mapping[str, str]:
+    return MappingProxyType(
+        {
+            "Accept": "application/vnd.github+json",
+            "Authorization": f"Bearer {token}",
+            "X-GitHub-Api-Version": "2022-11-28",
+        }
+    )
 
 
-def github_headers(token: str) -> dict:
-    return {
-        "Accept": "application/vnd.github+json",
-        "Authorization": f"Bearer {token}",
-        "X-GitHub-Api-Version": "2022-11-28",
-    }
+RATE_LIMIT_MAX_PAUSE = 60.0
+
+_rate_limit_lock = threading.Lock()
+_rate_limited_until = 0.0
+
+
+def wait_for_rate_limit() -> None:
+    with _rate_limit_lock:
+        delay = _rate_limited_until - time.monotonic()
+    if delay > 0:
+        time.sleep(delay)
+
+
+def note_rate_limit(headers) -> bool:
+    pause = 0.0
+    retry_after = headers.get("Retry-After")
+    if retry_after and retry_after.isdigit():
+        pause = float(retry_after)
+    elif headers.get("X-RateLimit-Remaining") == "0":
+        reset = headers.get("X-RateLimit-Reset")
+        if reset and reset.isdigit():
+            pause = int(reset) - time.time()
+    if pause <= 0:
+        return False
+    if pause > RATE_LIMIT_MAX_PAUSE:
+        return True
+
+    global _rate_limited_until
+    until = time.monotonic() + pause
+    with _rate_limit_lock:
+        _rate_limited_until = max(_rate_limited_until, until)
+    return False
 
 
 def _request_with_retry(
@@ -49,10 +100,13 @@ def _request_with_retry(
 ) -> requests.Response:
     last_exc: Exception | None = None
     headers = github_headers(token)
+    exhausted = False
 
     for attempt in range(1, max_attempts + 1):
         try:
-            response = requests.get(url, headers=headers, timeout=timeout)
+            wait_for_rate_limit()
+            response = _session.get(url, headers=headers, timeout=timeout)
+            exhausted = note_rate_limit(response.headers)
             if response.status_code == 401:
                 logger.error(
                     "github.auth_failed",
@@ -64,7 +118,7 @@ def _request_with_retry(
 
             if response.status_code in {403, 429}:
                 remaining = response.headers.get("X-RateLimit-Remaining")
-                if remaining == "0":
+                if remaining == "0" or exhausted:
                     reset = response.headers.get("X-RateLimit-Reset")
                     logger.warning(
                         "github.rate_limit",
@@ -80,7 +134,7 @@ def _request_with_retry(
                 "github.request.failed",
                 extra={"url": url, "attempt": attempt, "max_attempts": max_attempts},
             )
-            if _auth_failed:
+            if _auth_failed or exhausted:
                 break
             if attempt >= max_attempts:
                 break
@@ -101,28 +155,186 @@ def get_issue(owner: str, repo: str, number: int, token: str) -> dict:
         f"https://api.github.com/repos/{owner}/{repo}/issues/{number}",
         token,
     )
-    return response.json()
+    return _decode_json(response)
+
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+ISSUES_BATCH_SIZE = 50
+ISSUES_CONCURRENCY = 4
+ISSUE_CACHE_TTL = 600.0
+
+_IssueKey = tuple[str, str, str, int]
+_issue_cache: dict[_IssueKey, tuple[float, dict]] = {}
+_issue_cache_lock = threading.Lock()
+
+_DIFFICULTY_FIELD = "dificuldade"
+
+_ISSUE_SELECTION = """
+    title
+    body
+    labels(first: 100) { nodes { name } }
+    projectItems(first: 50) {
+      nodes {
+        fieldValues(first: 50) {
+          nodes {
+            __typename
+            ... on ProjectV2ItemFieldNumberValue { number field { ... on ProjectV2FieldCommon { name } } }
+            ... on ProjectV2ItemFieldSingleSelectValue { name field { ... on ProjectV2FieldCommon { name } } }
+            ... on ProjectV2ItemFieldTextValue { text field { ... on ProjectV2FieldCommon { name } } }
+          }
+        }
+      }
+    }
+"""
+
+_ISSUE_FRAGMENTS = (
+    "fragment IssueFields on Issue {" + _ISSUE_SELECTION + "}\n"
+    "fragment PullFields on PullRequest {" + _ISSUE_SELECTION + "}\n"
+)
+
+
+@lru_cache(maxsize=ISSUES_BATCH_SIZE)
+def _build_issues_query(count: int) -> str:
+    params = ", ".join(f"$o{i}: String!, $r{i}: String!, $n{i}: Int!" for i in range(count))
+    aliases = "\n".join(
+        f"  i{i}: repository(owner: $o{i}, name: $r{i}) {{"
+        f" issueOrPullRequest(number: $n{i}) {{ ...IssueFields ...PullFields }} }}"
+        for i in range(count)
+    )
+    return f"query({params}) {{\n{aliases}\n}}\n{_ISSUE_FRAGMENTS}"
+
+
+def _post_issues_batch(
+    batch: list[tuple[str, tuple[str, str, int]]],
+    headers: Mapping[str, str],
+    auth_failed: threading.Event,
+    *,
+    max_attempts: int = 3,
+    base_delay: float = 0.5,
+) -> dict[str, dict]:
+    variables: dict[str, object] = {}
+    for i, (_, (owner, repo, number)) in enumerate(batch):
+        variables[f"o{i}"] = owner
+        variables[f"r{i}"] = repo
+        variables[f"n{i}"] = number
+    payload = {"query": _build_issues_query(len(batch)), "variables": variables}
+
+    global _auth_failed
+    for attempt in range(1, max_attempts + 1):
+        if auth_failed.is_set():
+            raise requests.RequestException("GitHub authentication failed (401)")
+        wait_for_rate_limit()
+        resp = _session.post(GRAPHQL_URL, json=payload, headers=headers, timeout=15)
+        exhausted = note_rate_limit(resp.headers)
+        if resp.status_code == 401:
+            logger.error(
+                "github.auth_failed",
+                extra={"url": GRAPHQL_URL, "status": resp.status_code},
+            )
+            _auth_failed = True
+            auth_failed.set()
+            raise requests.RequestException("GitHub authentication failed (401)")
+        if resp.status_code in {403, 429} and exhausted:
+            logger.warning(
+                "github.rate_limit",
+                extra={"count": len(batch), "reset": resp.headers.get("X-RateLimit-Reset")},
+            )
+            raise requests.RequestException("GitHub rate limit exceeded")
+        if resp.status_code in {403, 429} and attempt < max_attempts:
+            delay = base_delay * (2 ** (attempt - 1))
+            logger.warning(
+                "github.rate_limit",
+                extra={"count": len(batch), "attempt": attempt, "delay": delay},
+            )
+            time.sleep(delay)
+            continue
+        resp.raise_for_status()
+        _auth_failed = False
+        break
+
+    data = _decode_json(resp).get("data") or {}
+    results: dict[str, dict] = {}
+    for i, (url, _) in enumerate(batch):
+        node = (data.get(f"i{i}") or {}).get("issueOrPullRequest")
+        if node:
+            results[url] = node
+    return results
+
+
+def get_issues_bulk(
+    token: str, urls: list[str], *, raise_on_error: bool = False
+) -> dict[str, dict]:
+    targets: dict[str, tuple[str, str, int]] = {}
+    for url in urls:
+        if url in targets:
+            continue
+        try:
+            targets[url] = parse_github_url(url)
+        except ValueError as exc:
+            if raise_on_error:
+                raise
+            logger.warning("github.url.invalid", extra={"url": url, "error": str(exc)})
+
+    results: dict[str, dict] = {}
+    token_key = hashlib.blake2b(token.encode("utf-8")).hexdigest()
+    now = time.monotonic()
+    pending = []
+    with _issue_cache_lock:
+        for url, (owner, repo, number) in targets.items():
+            cached = _issue_cache.get((token_key, owner.lower(), repo.lower(), number))
+            if cached and now - cached[0] < ISSUE_CACHE_TTL:
+                results[url] = cached[1]
+            else:
+                pending.append((url, (owner, repo, number)))
+
+    batches = [
+        pending[start:start + ISSUES_BATCH_SIZE]
+        for start in range(0, len(pending), ISSUES_BATCH_SIZE)
+    ]
+    if not batches:
+        return results
+
+    fetched: dict[str, dict] = {}
+    headers = github_headers(token)
+    auth_failed = threading.Event()
+    with ThreadPoolExecutor(max_workers=min(ISSUES_CONCURRENCY, len(batches))) as pool:
+        futures = [
+            pool.submit(_post_issues_batch, batch, headers, auth_failed) for batch in batches
+        ]
+        for batch, future in zip(batches, futures):
+            try:
+                fetched.update(future.result())
+            except (requests.RequestException, ValueError) as exc:
+                if raise_on_error:
+                    raise
+                logger.warning(
+                    "github.issues.fetch_failed",
+                    extra={"count": len(batch), "error": str(exc)},
+                )
+
+    now = time.monotonic()
+    with _issue_cache_lock:
+        expired = [k for k, (ts, _) in _issue_cache.items() if now - ts >= ISSUE_CACHE_TTL]
+        for k in expired:
+            del _issue_cache[k]
+        for url, node in fetched.items():
+            owner, repo, number = targets[url]
+            _issue_cache[(token_key, owner.lower(), repo.lower(), number)] = (now, node)
+    results.update(fetched)
+    return results
 
 
 def get_issue_title(token: str, url: str, *, raise_on_error: bool = False) -> Optional[str]:
-    try:
-        owner, repo, number = parse_github_url(url)
-    except ValueError as exc:
-        if raise_on_error:
-            raise
-        logger.warning(
-            "github.url.invalid",
-            extra={"url": url, "error": str(exc)},
-        )
+    issue = get_issues_bulk(token, [url], raise_on_error=raise_on_error).get(url)
+    if not issue:
         return None
+    return issue.get("title") or None
 
 
 def _parse_numeric_from_text(value: str | None) -> float:
     if not value:
         return 0.0
-    import re
-
-    match = re.search(r"-?\d+(?:[\.,]\d+)?", str(value))
+    match = _NUMBER_RE.search(str(value))
     if not match:
         return 0.0
     raw = match.group(0).replace(",", ".")
@@ -132,100 +344,52 @@ def _parse_numeric_from_text(value: str | None) -> float:
         return 0.0
 
 
+_DIFFICULTY_SCALE = (
+    ("XS", 1.0),
+    ("XL", 5.0),
+    ("S", 2.0),
+    ("M", 3.0),
+    ("L", 4.0),
+    ("P0", 5.0),
+    ("P1", 4.0),
+    ("P2", 3.0),
+    ("P3", 2.0),
+    ("P4", 1.0),
+)
+_DIFFICULTY_PREFIXES = tuple(key for key, _ in _DIFFICULTY_SCALE)
+
+
+@lru_cache(maxsize=1024)
 def _map_difficulty_label(label: str | None) -> float:
     if not label:
         return 0.0
     normalized = str(label).strip().upper()
-    scale_map = {
-        "XS": 1.0,
-        "S": 2.0,
-        "M": 3.0,
-        "L": 4.0,
-        "XL": 5.0,
-        "P0": 5.0,
-        "P1": 4.0,
-        "P2": 3.0,
-        "P3": 2.0,
-        "P4": 1.0,
-    }
-    for key, value in scale_map.items():
-        if normalized.startswith(key):
-            return value
+    if normalized.startswith(_DIFFICULTY_PREFIXES):
+        for key, value in _DIFFICULTY_SCALE:
+            if normalized.startswith(key):
+                return value
     return _parse_numeric_from_text(label)
 
 
-def get_issue_difficulty(token: str, url: str, *, raise_on_error: bool = False) -> Optional[float]:
-    try:
-        owner, repo, number = parse_github_url(url)
-    except ValueError as exc:
-        if raise_on_error:
-            raise
-        logger.warning("github.url.invalid", extra={"url": url, "error": str(exc)})
-        return None
-
-    try:
-        issue = get_issue(owner, repo, number, token)
-    except requests.RequestException as exc:
-        if raise_on_error:
-            raise
-        logger.debug("github.issue.fetch_failed", extra={"url": url, "error": str(exc)})
-        return None
-
-    node_id = issue.get("node_id")
-    if node_id:
-        query = """
-        query($id: ID!) {
-          node(id: $id) {
-            ... on Issue {
-              projectItems(first:50) {
-                nodes {
-                  fieldValues(first:50) {
-                    nodes {
-                      __typename
-                      ... on ProjectV2ItemFieldNumberValue { number field { ... on ProjectV2FieldCommon { name } } }
-                      ... on ProjectV2ItemFieldSingleSelectValue { name field { ... on ProjectV2FieldCommon { name } } }
-                      ... on ProjectV2ItemFieldTextValue { text field { ... on ProjectV2FieldCommon { name } } }
-                    }
-                  }
-                }
-              }
-            }
-          }
-        }
-        """
-        try:
-            resp = requests.post(
-                "https://api.github.com/graphql",
-                json={"query": query, "variables": {"id": node_id}},
-                headers=github_headers(token),
-                timeout=15,
-            )
-            if resp.status_code == 200:
-                payload = resp.json()
-                data = payload.get("data", {}).get("node") or {}
-                project_items = data.get("projectItems", {}).get("nodes", [])
-                for item in project_items:
-                    for fv in (item.get("fieldValues") or {}).get("nodes", []) or []:
-                        field = fv.get("field") or {}
-                        field_name = (field.get("name") or "").strip().lower()
-                        if field_name != "dificuldade":
-                            continue
-                        t = fv.get("__typename")
-                        if t == "ProjectV2ItemFieldNumberValue":
-                            try:
-                                return float(fv.get("number") or 0.0)
-                            except Exception:
-                                return None
-                        if t == "ProjectV2ItemFieldSingleSelectValue":
-                            return _map_difficulty_label(fv.get("name")) or None
-                        if t == "ProjectV2ItemFieldTextValue":
-                            return _map_difficulty_label(fv.get("text")) or None
-        except requests.RequestException:
-            pass
-
-    labels = issue.get("labels") or []
-    for lbl in labels:
-        name = lbl.get("name") if isinstance(lbl, dict) else str(lbl)
+def _difficulty_from_issue(issue: dict) -> Optional[float]:
+    for item in (issue.get("projectItems") or {}).get("nodes", []) or []:
+        for fv in (item.get("fieldValues") or {}).get("nodes", []) or []:
+            field = fv.get("field") or {}
+            if (field.get("name") or "").strip().lower() != _DIFFICULTY_FIELD:
+                continue
+            t = fv.get("__typename")
+            if t == "ProjectV2ItemFieldNumberValue":
+                try:
+                    return float(fv.get("number") or 0.0)
+                except Exception:
+                    return None
+            if t == "ProjectV2ItemFieldSingleSelectValue":
+                return _map_difficulty_label(fv.get("name")) or None
+            if t == "ProjectV2ItemFieldTextValue":
+                return _map_difficulty_label(fv.get("text")) or None
+
+    for lbl in (issue.get("labels") or {}).get("nodes", []) or []:
+        name = lbl.get("name")
         if not name:
             continue
         val = _map_difficulty_label(name)
@@ -233,9 +397,7 @@ def get_issue_difficulty(token: str, url: str, *, raise_on_error: bool = False)
             return float(val)
 
     body = issue.get("body") or ""
-    import re
-
-    m = re.search(r"(?i)dificuldade[:\s]*([XSMLP0-9\.,]+)", body or "")
+    m = _BODY_DIFFICULTY_RE.search(body)
     if m:
         parsed = m.group(1)
         difficulty_val = _map_difficulty_label(parsed) or _parse_numeric_from_text(parsed)
@@ -243,15 +405,10 @@ def get_issue_difficulty(token: str, url: str, *, raise_on_error: bool = False)
             return float(difficulty_val)
 
     return None
-    try:
-        issue = get_issue(owner, repo, number, token)
-        title = issue.get("title")
-        return title if title else None
-    except requests.RequestException as exc:
-        if raise_on_error:
-            raise
-        logger.debug(
-            "github.issue.fetch_failed",
-            extra={"url": url, "error": str(exc)},
-        )
+
+
+def get_issue_difficulty(token: str, url: str, *, raise_on_error: bool = False) -> Optional[float]:
+    issue = get_issues_bulk(token, [url], raise_on_error=raise_on_error).get(url)
+    if not issue:
         return None
+    return _difficulty_from_issue(issue)
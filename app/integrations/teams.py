@@ -1,12 +1,20 @@
 from __future__ import annotations
 
+import json
 import logging
 import time
 
 import requests
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+_session = requests.Session()
+
 
 def _mask_webhook(url: str) -> str:
     if not url:
@@ -26,10 +34,12 @@ def _post_with_retry(
 ) -> requests.Response:
     last_exc: Exception | None = None
     masked_url = _mask_webhook(url)
+    body = orjson.dumps(payload) if orjson else json.dumps(payload).encode("utf-8")
+    headers = {"Content-Type": "application/json"}
 
     for attempt in range(1, max_attempts + 1):
         try:
-            response = requests.post(url, json=payload, timeout=timeout)
+            response = _session.post(url, data=body, headers=headers, timeout=timeout)
             response.raise_for_status()
             return response
         except requests.RequestException as exc:
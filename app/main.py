@@ -64,7 +64,8 @@ def create_app() -> FastAPI:
 def _configure_logging() -> None:
     class _FormsLinkFilter(logging.Filter):
         def filter(self, record: logging.LogRecord) -> bool:
-            return record.name == "app.main" and record.getMessage().startswith("forms.link")
+            msg = record.msg
+            return record.name == "app.main" and isinstance(msg, str) and msg.startswith("forms.link")
 
     for logger_name in (
         "httpx",
@@ -5,10 +5,13 @@ import math
 import time
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta
+from functools import lru_cache
 from typing import Any
 
 import requests
 
+from app.integrations.github import note_rate_limit, wait_for_rate_limit
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,6 +38,12 @@ def _safe_int(value: Any) -> int:
         return 0
 
 
+def _percent(value: int, total: int) -> int:
+    if total <= 0:
+        return 0
+    return int(round((value / total) * 100))
+
+
 def _donut_svg(label: str, percent: int) -> str:
     width = 170
     height = 150
@@ -124,8 +133,10 @@ def _request_with_retry(
     base_delay: float = 0.5,
 ) -> requests.Response:
     last_exc: Exception | None = None
+    exhausted = False
     for attempt in range(1, max_attempts + 1):
         try:
+            wait_for_rate_limit()
             response = requests.request(
                 method,
                 url,
@@ -133,6 +144,7 @@ def _request_with_retry(
                 params=params,
                 timeout=timeout,
             )
+            exhausted = note_rate_limit(response.headers) and response.status_code in {403, 429}
             response.raise_for_status()
             return response
         except requests.RequestException as exc:
@@ -145,7 +157,7 @@ def _request_with_retry(
                     "max_attempts": max_attempts,
                 },
             )
-            if attempt >= max_attempts:
+            if exhausted or attempt >= max_attempts:
                 break
             delay = base_delay * (2 ** (attempt - 1))
             time.sleep(delay)
@@ -190,7 +202,7 @@ def _fetch_closed_issues_count(
             if not closed_at:
                 continue
             try:
-                closed_dt = datetime.fromisoformat(closed_at.replace("Z", "+00:00"))
+                closed_dt = datetime.fromisoformat(closed_at)
                 if closed_dt.tzinfo is not None:
                     closed_dt = closed_dt.astimezone(tz=None).replace(tzinfo=None)
             except ValueError:
@@ -202,17 +214,17 @@ def _fetch_closed_issues_count(
     return count
 
 
-def _extract_labels(issue: dict[str, Any]) -> list[str]:
+def _extract_labels(issue: dict[str, Any]) -> tuple[str, ...]:
     labels = issue.get("labels") or []
     names = []
     for label in labels:
         name = label.get("name") if isinstance(label, dict) else str(label)
         if name:
             names.append(str(name).strip().lower())
-    return names
+    return tuple(names)
 
 
-def _label_matches(labels: list[str], keywords: list[str]) -> bool:
+def _label_matches(labels: tuple[str, ...], keywords: list[str]) -> bool:
     for label in labels:
         for key in keywords:
             if key in label:
@@ -220,7 +232,8 @@ def _label_matches(labels: list[str], keywords: list[str]) -> bool:
     return False
 
 
-def _classify_status(labels: list[str], state: str) -> str:
+@lru_cache(maxsize=1024)
+def _classify_status(labels: tuple[str, ...], state: str) -> str:
     if state == "closed":
         return "done"
     if _label_matches(labels, ["review", "code review", "in review", "pr review"]):
@@ -234,7 +247,8 @@ def _classify_status(labels: list[str], state: str) -> str:
     return "backlog"
 
 
-def _has_difficulty(labels: list[str]) -> bool:
+@lru_cache(maxsize=1024)
+def _has_difficulty(labels: tuple[str, ...]) -> bool:
     return _label_matches(labels, ["dificuldade", "difficulty", "hard"])
 
 
@@ -360,7 +374,7 @@ def _load_from_urls(
             due_dt = None
             if due_on:
                 try:
-                    due_dt = datetime.fromisoformat(due_on.replace("Z", "+00:00")).date()
+                    due_dt = datetime.fromisoformat(due_on).date()
                 except Exception:
                     due_dt = None
 
@@ -430,23 +444,24 @@ def load_milestone_section(
     count = len(entries)
     columns = 2 if count == 4 else min(3, count)
 
-    aggregated_milestones = {}
+    aggregated_milestones: dict[str, dict[str, Any]] = {}
     for entry in entries:
         key = entry.name.strip().lower()
-        if key not in aggregated_milestones:
-            aggregated_milestones[key] = {
+        data = aggregated_milestones.get(key)
+        if data is None:
+            data = aggregated_milestones[key] = {
                 "name": entry.name,
                 "total_closed": 0,
-                "total_issues": 0
+                "total_issues": 0,
             }
-        aggregated_milestones[key]["total_closed"] += entry.total_closed
-        aggregated_milestones[key]["total_issues"] += entry.total_issues
+        data["total_closed"] += entry.total_closed
+        data["total_issues"] += entry.total_issues
 
     milestone_cards = []
     for key, data in aggregated_milestones.items():
         total_issues = data["total_issues"]
         total_closed = data["total_closed"]
-        percent = int(round((total_closed / total_issues) * 100)) if total_issues > 0 else 0
+        percent = _percent(total_closed, total_issues)
         name = data["name"]
         
         milestone_cards.append({
@@ -474,11 +489,6 @@ def load_milestone_section(
     done_total = status_totals["done_count"]
     difficulty_total = status_totals["difficulty_total"]
 
-    def _percent(value: int, total: int) -> int:
-        if total <= 0:
-            return 0
-        return int(round((value / total) * 100))
-
     done_percent = _percent(done_total, total_issues)
     done_review_percent = _percent(done_total + review_total, total_issues)
 
@@ -498,12 +508,12 @@ def load_milestone_section(
         "difficulty_total": difficulty_total,
         "difficulty_review": status_totals["difficulty_review"],
         "difficulty_done": status_totals["difficulty_done"],
-        "done_count_percent": _percent(done_total, total_issues),
+        "done_count_percent": done_percent,
         "done_difficulty_percent": _percent(
             status_totals["difficulty_done"],
             difficulty_total,
         ),
-        "done_review_count_percent": _percent(done_total + review_total, total_issues),
+        "done_review_count_percent": done_review_percent,
         "done_review_difficulty_percent": _percent(
             status_totals["difficulty_done"] + status_totals["difficulty_review"],
             difficulty_total,
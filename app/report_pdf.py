@@ -11,7 +11,7 @@ import openai
 from weasyprint import CSS, HTML
 
 from app.config import get_assets_dir, get_settings, get_views_dir
-from app.integrations.github import get_issue_title
+from app.integrations.github import get_issues_bulk
 from app.milestones import load_milestone_section
 from app.github_projects import load_project_charts
 
@@ -36,37 +36,25 @@ def render_pdf(
     )
 
     if settings.github_token:
-        url_cache: dict[str, str] = {}
-        for team_reports in reports_by_team.values():
-            for report in team_reports:
-                tasks = report.get("tasks") or []
-                for task in tasks:
-                    url = task.get("task_url")
-                    if not url:
-                        continue
-                    if url not in url_cache:
-                        title = get_issue_title(settings.github_token, url)
-                        if title:
-                            url_cache[url] = title
-                    title = url_cache.get(url)
-                    if title:
-                        task["title"] = title
+        task_lists = [
+            report.get("tasks") or []
+            for team_reports in reports_by_team.values()
+            for report in team_reports
+        ]
         if reports_by_project:
-            for project_reports in reports_by_project.values():
-                for team_reports in project_reports.values():
-                    for report in team_reports:
-                        tasks = report.get("tasks") or []
-                        for task in tasks:
-                            url = task.get("task_url")
-                            if not url:
-                                continue
-                            if url not in url_cache:
-                                title = get_issue_title(settings.github_token, url)
-                                if title:
-                                    url_cache[url] = title
-                            title = url_cache.get(url)
-                            if title:
-                                task["title"] = title
+            task_lists.extend(
+                report.get("tasks") or []
+                for project_reports in reports_by_project.values()
+                for team_reports in project_reports.values()
+                for report in team_reports
+            )
+        urls = [task["task_url"] for tasks in task_lists for task in tasks if task.get("task_url")]
+        issues = get_issues_bulk(settings.github_token, urls)
+        for tasks in task_lists:
+            for task in tasks:
+                title = (issues.get(task.get("task_url")) or {}).get("title")
+                if title:
+                    task["title"] = title
 
     def _normalize_delivery_links(report: dict) -> None:
         links = report.get("deliveries_links")
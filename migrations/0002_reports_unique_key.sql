@@ -0,0 +1,11 @@
+-- Keeps only the newest report per (week, project, team, developer); older
+-- duplicates and their tasks (ON DELETE CASCADE) are removed so the key can be unique.
+DELETE FROM reports
+WHERE id NOT IN (
+    SELECT MAX(id)
+    FROM reports
+    GROUP BY week_id, project_slug, team_slug, developer_name
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_reports_key
+    ON reports (week_id, project_slug, team_slug, developer_name);
@@ -0,0 +1,10 @@
+CREATE INDEX IF NOT EXISTS ix_reports_week_project_team
+    ON reports (week_id, project_slug, team_slug, created_at);
+CREATE INDEX IF NOT EXISTS ix_reports_proj_team_created
+    ON reports (project_slug, team_slug, created_at);
+CREATE INDEX IF NOT EXISTS ix_tasks_report
+    ON tasks (report_id, created_at);
+
+DROP INDEX IF EXISTS idx_reports_week;
+DROP INDEX IF EXISTS idx_reports_project_slug;
+DROP INDEX IF EXISTS idx_tasks_report;
@@ -0,0 +1,20 @@
+-- Re-submitted reports used to get team_name overwritten with project_name.
+-- Restore it from another report of the same team that kept the real name.
+UPDATE reports
+SET team_name = (
+    SELECT other.team_name
+    FROM reports AS other
+    WHERE other.project_slug = reports.project_slug
+      AND other.team_slug = reports.team_slug
+      AND other.team_name <> other.project_name
+    ORDER BY other.id DESC
+    LIMIT 1
+)
+WHERE team_name = project_name
+  AND EXISTS (
+    SELECT 1
+    FROM reports AS other
+    WHERE other.project_slug = reports.project_slug
+      AND other.team_slug = reports.team_slug
+      AND other.team_name <> other.project_name
+  );